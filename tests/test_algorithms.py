@@ -0,0 +1,156 @@
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+from weighted_maximum_matching.algorithms import Edge, MatchingGraph, Vertex
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ParityMatchingGraph(MatchingGraph):
+
+    def get_conditions(self, x_conditions, y_conditions, *args, **kwargs):
+        x_item = x_conditions['value'].item
+        y_item = y_conditions['value'].item
+        return (x_item == y_item, x_item % 2 == 0)
+
+
+class PairsMatchingGraph(MatchingGraph):
+    """
+    Matches the items given as pairs, regardless of their equality.
+    """
+
+    def __init__(self, x_set, y_set, pairs, *args, **kwargs):
+        self.pairs = set(pairs)
+        super().__init__(x_set, y_set, *args, **kwargs)
+
+    def get_conditions(self, x_conditions, y_conditions, *args, **kwargs):
+        pair = (x_conditions['value'].item, y_conditions['value'].item)
+        return (pair in self.pairs,)
+
+
+def maximum_cardinality(edges, taken=frozenset()):
+    """
+    Returns the size of a maximum matching by trying every edge.
+    """
+    best = 0
+    for index, edge in enumerate(edges):
+        vertex_ids = {id(edge.vertex_1), id(edge.vertex_2)}
+        if vertex_ids & taken:
+            continue
+        best = max(
+            best,
+            1 + maximum_cardinality(edges[index + 1:], taken | vertex_ids))
+    return best
+
+
+class EdgeTestCase(unittest.TestCase):
+
+    def test_get_vertices(self):
+        vertex_1, vertex_2 = Vertex(1), Vertex(2)
+        edge = Edge(vertex_1, vertex_2)
+        vertices = edge.get_vertices()
+        self.assertIs(vertices[0], vertex_1)
+        self.assertIs(vertices[1], vertex_2)
+
+    def test_get_vertices_reversed(self):
+        vertex_1, vertex_2 = Vertex(1), Vertex(2)
+        edge = Edge(vertex_1, vertex_2)
+        vertices = edge.get_vertices(True)
+        self.assertIs(vertices[0], vertex_2)
+        self.assertIs(vertices[1], vertex_1)
+
+
+class MatchingGraphTestCase(unittest.TestCase):
+
+    def test_runs_without_interaction(self):
+        code = (
+            'from weighted_maximum_matching.algorithms import MatchingGraph\n'
+            'MatchingGraph([1, 2, 3], [3, 2, 1])\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=ROOT,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn('(Pdb)', result.stdout)
+
+    def test_get_vertex_ignores_nan(self):
+        nan = float('nan')
+        hashable = MatchingGraph([1, nan], [2])
+        unhashable = MatchingGraph([1, nan, [3]], [2])
+        self.assertIs(hashable.get_vertex(1), hashable.x_vertices[0])
+        self.assertIsNone(hashable.get_vertex(nan))
+        self.assertIsNone(unhashable.get_vertex(nan))
+
+    def test_unique_weights_while_changing_weights(self):
+        graph = ParityMatchingGraph([1, 2, 3, 4], [1, 2, 3, 4])
+        self.assertEqual(graph.unique_weights, {1, 2})
+        for weight in graph.unique_weights:
+            for edge in graph.edges:
+                if edge.weight == weight:
+                    edge.add_weight(10)
+        self.assertEqual(graph.unique_weights, {11, 12})
+
+
+
+class HopcroftKarpTestCase(unittest.TestCase):
+
+    def assertMaximumMatching(self, graph):
+        matches = graph.matches
+        x_ids = {id(edge.vertex_1) for edge in matches}
+        y_ids = {id(edge.vertex_2) for edge in matches}
+        self.assertEqual(len(x_ids), len(matches))
+        self.assertEqual(len(y_ids), len(matches))
+        self.assertEqual(len(matches), maximum_cardinality(graph.edges))
+
+    def test_needs_augmenting_path(self):
+        # Whichever side is iterated, taking the first free partner of
+        # each vertex leaves one vertex unmatched.
+        pairs = [('a', 'c'), ('a', 'd'), ('b', 'c')]
+        for according_to_x_set in (True, False):
+            graph = PairsMatchingGraph(
+                ['a', 'b'], ['c', 'd'], pairs,
+                according_to_x_set=according_to_x_set)
+            self.assertEqual(len(graph.matches), 2)
+            self.assertMaximumMatching(graph)
+            self.assertEqual(
+                {(edge.vertex_1.item, edge.vertex_2.item)
+                 for edge in graph.matches},
+                {('a', 'd'), ('b', 'c')})
+
+    def test_random_graphs(self):
+        generator = random.Random(0)
+        for _ in range(200):
+            x_set = list(range(generator.randint(0, 6)))
+            y_set = list(range(generator.randint(0, 6)))
+            pairs = [
+                (x_item, y_item) for x_item in x_set for y_item in y_set
+                if generator.random() < 0.4
+            ]
+            for according_to_x_set in (True, False):
+                graph = PairsMatchingGraph(
+                    x_set, y_set, pairs,
+                    according_to_x_set=according_to_x_set)
+                self.assertMaximumMatching(graph)
+
+    def test_repeated_items(self):
+        generator = random.Random(1)
+        for _ in range(100):
+            x_set = [generator.randint(0, 3) for _ in range(6)]
+            y_set = [generator.randint(0, 3) for _ in range(6)]
+            for according_to_x_set in (True, False):
+                graph = MatchingGraph(
+                    x_set, y_set, according_to_x_set=according_to_x_set)
+                self.assertMaximumMatching(graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
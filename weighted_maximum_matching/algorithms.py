@@ -1,3 +1,46 @@
+from collections import Counter, deque
+from operator import attrgetter
+
+
+_UNSET = object()
+_get_weight = attrgetter('weight')
+
+
+def _keep_order(vertex_a, vertex_b):
+    """
+    Returns the pair of vertices as they were given.
+    """
+    return vertex_a, vertex_b
+
+
+def _swap_order(vertex_a, vertex_b):
+    """
+    Returns the pair of vertices in reverse.
+    """
+    return vertex_b, vertex_a
+
+
+def _group_by_item(vertices):
+    """
+    Returns the vertices grouped by item in a dictionary,
+    or None if any of the items is not hashable.
+    """
+    groups = {}
+    try:
+        for vertex in vertices:
+            groups.setdefault(vertex.item, []).append(vertex)
+    except TypeError:
+        return None
+    return groups
+
+
+def _other_vertex(edge, vertex):
+    """
+    Returns the vertex at the other end of the edge.
+    """
+    return edge.vertex_1 if edge.vertex_2 is vertex else edge.vertex_2
+
+
 class Vertex:
     """
     This represents an item.
@@ -6,27 +49,39 @@ class Vertex:
 
         :param item: :type any:
             This is the data which the vertex will represent.
+
+    - Attributes
+
+        index: :type int:
+            The position of the vertex within its set. This is
+            assigned by the graph once the vertices are initialized.
     """
 
+    __slots__ = ('neigbors', 'edges', 'item', 'index', '_heaviest_cache')
+
     def __init__(self, item, *args, **kwargs):
         self.neigbors = []
         self.edges = []
         self.item = item
+        self.index = None
+        self._heaviest_cache = _UNSET
 
     def __eq__(self, other):
-        try:
-            other.item
-        except AttributeError:
-            return False
+        if not isinstance(other, Vertex):
+            return NotImplemented
         return self.item == other.item
 
     def __lt__(self, other):
-        try:
-            other.item
-        except AttributeError:
-            return False
+        if not isinstance(other, Vertex):
+            return NotImplemented
         return self.item < other.item
 
+    def __hash__(self):
+        try:
+            return hash(self.item)
+        except TypeError:
+            return id(self.item)
+
     def __repr__(self):
         return '<Vertex ({})>'.format(self.item)
 
@@ -35,12 +90,14 @@ class Vertex:
         """
         Returns the edge connected to the vertex
         with the largest weight.
+
+        The result is cached until an edge is added to the vertex
+        or the weight of one of its edges changes.
         """
-        try:
-            edge = max(self.edges)
-        except ValueError:
-            edge = None
-        return edge
+        if self._heaviest_cache is _UNSET:
+            self._heaviest_cache = max(
+                self.edges, key=_get_weight, default=None)
+        return self._heaviest_cache
 
     def add_neighbor(self, other_vertex, edge):
         """
@@ -55,6 +112,7 @@ class Vertex:
         """
         self.neigbors.append(other_vertex)
         self.edges.append(edge)
+        self._heaviest_cache = _UNSET
 
 
 class Edge:
@@ -69,31 +127,74 @@ class Edge:
             The second vertex of the edge.
         :param weight: :type int:
             The initial weight of the edge. Defaults as 1.
+        :param link: :type boolean:
+            Defaults as True. If False, the edge is not added to
+            the neighbors of its vertices, and whoever creates the
+            edge is responsible for doing so.
+
+    - Attributes
+
+        graph: :type MatchingGraph:
+            The graph counting the weight of the edge, or None if
+            no graph is counting it.
     """
 
-    def __init__(self, vertex_1, vertex_2, weight=1, *args, **kwargs):
+    __slots__ = ('vertex_1', 'vertex_2', '_weight', 'graph')
+
+    def __init__(
+            self, vertex_1, vertex_2, weight=1,
+            *args, link=True, **kwargs):
         self.vertex_1 = vertex_1
         self.vertex_2 = vertex_2
-        self.weight = 1
-        vertex_1.add_neighbor(vertex_2, self)
-        vertex_2.add_neighbor(vertex_1, self)
+        self.graph = None
+        self.weight = weight
+        if link:
+            vertex_1.add_neighbor(vertex_2, self)
+            vertex_2.add_neighbor(vertex_1, self)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Edge):
+            return NotImplemented
+        if self.weight != other.weight:
             return False
-        parallel, reverse = _get_parallels(other)
-        return self.weight == other.weight and (parallel or reverse)
+        vertex_1, vertex_2 = self.vertex_1, self.vertex_2
+        other_1, other_2 = other.vertex_1, other.vertex_2
+        if ((vertex_1 is other_1 and vertex_2 is other_2)
+                or (vertex_1 is other_2 and vertex_2 is other_1)):
+            return True
+        parallel, reverse = self._get_parallels(other)
+        return parallel or reverse
 
     def __lt__(self, other):
         if not isinstance(other, Edge):
-            return False
-        parallel, reverse = _get_parallels(other)
+            return NotImplemented
+        parallel, reverse = self._get_parallels(other)
         return self.weight < other.weight and (parallel or reverse)
 
     def __repr__(self):
         return '<Edge ({}) | ({})>'.format(
             self.vertex_1.item, self.vertex_2.item)
 
+    @property
+    def weight(self):
+        """
+        The weight of the edge.
+        """
+        return self._weight
+
+    @weight.setter
+    def weight(self, value):
+        graph = getattr(self, 'graph', None)
+        if graph is not None:
+            graph._recount_weight(self._weight, value)
+        self._weight = value
+        for attr in ('vertex_1', 'vertex_2'):
+            vertex = getattr(self, attr, None)
+            if vertex is not None:
+                vertex._heaviest_cache = _UNSET
+
     def get_vertices(self, reverse=False):
         """
         Returns the vertices in the edge as a tuple.
@@ -104,7 +205,9 @@ class Edge:
                 Defaults as False. If True, returns the 2nd vertex
                 before the first.
         """
-        return [(vertex_1, vertex_2), (vertex_2, vertex_1)][reverse]
+        if reverse:
+            return self.vertex_2, self.vertex_1
+        return self.vertex_1, self.vertex_2
 
     def _get_parallels(self, other):
         """
@@ -155,19 +258,19 @@ class MatchingGraph:
             The type of edge that will be used to initialize the edge
             instances for the matching. Defaults as Edge.
         :param x_extra_vertex_initalization_values: :type dict:
-            Defaults as an empty dictionary. Should the vertex
-            class that will be used for the initialization of the
-            first set need to accept additional constructor
-            arguments, then they may be placed here. Preferably,
-            the item of the vertex must be able to identify
-            the key of the value.
+            Defaults as None, which is treated as an empty
+            dictionary. Should the vertex class that will be used
+            for the initialization of the first set need to accept
+            additional constructor arguments, then they may be placed
+            here. Preferably, the item of the vertex must be able to
+            identify the key of the value.
         :param y_extra_vertex_initalization_values: :type dict:
-            Defaults as an empty dictionary. Should the vertex
-            class that will be used for the initialization of the
-            second set need to accept additional constructor
-            arguments, then they may be placed here. Preferably,
-            the item of the vertex must be able to identify
-            the key of the value.
+            Defaults as None, which is treated as an empty
+            dictionary. Should the vertex class that will be used
+            for the initialization of the second set need to accept
+            additional constructor arguments, then they may be placed
+            here. Preferably, the item of the vertex must be able to
+            identify the key of the value.
         :param x_kwarg_extractor: :type method:
             Defaults as None. This is responsible for extracting
             kwargs from the x_extra_vertex_initalization_values.
@@ -193,8 +296,8 @@ class MatchingGraph:
             x_set_vertex_class=Vertex,
             y_set_vertex_class=Vertex,
             edge_class=Edge,
-            x_extra_vertex_initalization_values={},
-            y_extra_vertex_initalization_values={},
+            x_extra_vertex_initalization_values=None,
+            y_extra_vertex_initalization_values=None,
             x_kwarg_extractor=None,
             y_kwarg_extractor=None,
             according_to_x_set=True,
@@ -206,9 +309,12 @@ class MatchingGraph:
         self.edge_class = edge_class
         self.edges = []
         self.matches = []
+        self._weight_counts = Counter()
+        self._counted_edges = []
         self.according_to_x_set = according_to_x_set
-        self.vertex_attr_a = ['vertex_1', 'vertex_2'][according_to_x_set]
-        self.vertex_attr_b = ['vertex_2', 'vertex_1'][according_to_x_set]
+        self.vertex_attr_a = 'vertex_2' if according_to_x_set else 'vertex_1'
+        self.vertex_attr_b = 'vertex_1' if according_to_x_set else 'vertex_2'
+        self._default_conditions = self._uses_default_conditions()
         intialization_args = (
             x_extra_vertex_initalization_values,
             y_extra_vertex_initalization_values,
@@ -225,8 +331,15 @@ class MatchingGraph:
     def unique_weights(self):
         """
         Returns all the unique weights of all edges as a set.
+
+        The counts of the weights are kept up to date whenever the
+        weight of an edge changes, and the edges are only counted
+        again if their number changed since they were last counted.
+        Replacing an edge of self.edges in place is not detected.
         """
-        return set([edge.weight for edge in self.edges])
+        if len(self._counted_edges) != len(self.edges):
+            self._count_weights()
+        return set(self._weight_counts)
 
     @property
     def matched_x_vertices(self):
@@ -236,7 +349,7 @@ class MatchingGraph:
         return [edge.vertex_1 for edge in self.matches]
 
     @property
-    def matched_x_vertices(self):
+    def matched_y_vertices(self):
         """
         Returns all the vertices from the y set that have been matched.
         """
@@ -247,9 +360,10 @@ class MatchingGraph:
         """
         Returns all the vertices from the x set that were not matched.
         """
+        matched = {id(edge.vertex_1) for edge in self.matches}
         return [
             vertex for vertex in self.x_vertices
-            if vertex not in self.matched_x_vertices
+            if id(vertex) not in matched
         ]
 
     @property
@@ -257,21 +371,78 @@ class MatchingGraph:
         """
         Returns all the vertices from the y set that were not matched.
         """
+        matched = {id(edge.vertex_2) for edge in self.matches}
         return [
             vertex for vertex in self.y_vertices
-            if vertex not in self.matched_y_vertices
+            if id(vertex) not in matched
         ]
 
+    def _count_weights(self):
+        """
+        A private helper for counting the weights of all edges, and
+        having the edges report any change of weight to this graph.
+        Edges that are no longer in the graph stop reporting.
+        """
+        for edge in self._counted_edges:
+            if edge.graph is self:
+                edge.graph = None
+        for edge in self.edges:
+            edge.graph = self
+        self._counted_edges = list(self.edges)
+        self._weight_counts = Counter(edge.weight for edge in self.edges)
+
+    def _recount_weight(self, old_weight, new_weight):
+        """
+        A private helper for moving the count of an edge from its old
+        weight to its new weight.
+        """
+        counts = self._weight_counts
+        counts[old_weight] -= 1
+        if counts[old_weight] <= 0:
+            del counts[old_weight]
+        counts[new_weight] += 1
+
+    def _uses_default_conditions(self):
+        """
+        A private helper for checking if none of the matching hooks
+        were overridden, which means that two vertices are a match
+        only if their items are equal.
+        """
+        hooks = (
+            '_check_match',
+            'get_matching_arguments',
+            'get_x_set_condition_values',
+            'get_y_set_condition_values',
+            'get_conditions',
+            'assess_match',
+            'assess_compatibility',
+        )
+        vertex_classes = (self.x_set_vertex_class, self.y_set_vertex_class)
+        return (
+            all(
+                getattr(type(self), hook) is getattr(MatchingGraph, hook)
+                for hook in hooks
+            )
+            and all(
+                vertex_class.__eq__ is Vertex.__eq__
+                for vertex_class in vertex_classes
+            )
+        )
+
     def _initialize_vertices(
             self,
-            x_extra_vertex_initalization_values={},
-            y_extra_vertex_initalization_values={},
+            x_extra_vertex_initalization_values=None,
+            y_extra_vertex_initalization_values=None,
             x_kwarg_extractor=None,
             y_kwarg_extractor=None):
         """
         Initialize vertices based on values received from constructor.
         """
-        vertex_sets = ([],[])
+        if x_extra_vertex_initalization_values is None:
+            x_extra_vertex_initalization_values = {}
+        if y_extra_vertex_initalization_values is None:
+            y_extra_vertex_initalization_values = {}
+        vertex_sets = [[], []]
         vertex_data = [
             (
                 self.x_set,
@@ -288,13 +459,56 @@ class MatchingGraph:
         ]
         for index, data in enumerate(vertex_data):
             item_set, vertex_class, extra_values, extract = data
-            for item in item_set:
-                if extract:
-                    extras = extract(item, extra_values)
-                else:
-                    extras = {}
-                vertex_sets[index].append(vertex_class(item, **extras))
+            if extract:
+                vertex_sets[index] = [
+                    vertex_class(item, **extract(item, extra_values))
+                    for item in item_set
+                ]
+            else:
+                vertex_sets[index] = [
+                    vertex_class(item) for item in item_set]
+            for position, vertex in enumerate(vertex_sets[index]):
+                vertex.index = position
         self.x_vertices, self.y_vertices = vertex_sets
+        self._x_by_item = _group_by_item(self.x_vertices)
+        self._y_by_item = _group_by_item(self.y_vertices)
+
+    def get_vertex(self, item, side='x'):
+        """
+        Returns the first vertex of a set that represents the item,
+        or None if there is no such vertex.
+
+        The lookup takes constant time if all the items of the set
+        are hashable. Otherwise, the set is scanned for the item.
+        Items that are not equal to themselves, such as NaN, are
+        never found.
+
+        - Parameters
+
+            :param item: :type any:
+                The item of the vertex to look for.
+            :param side: :type str:
+                Defaults as 'x'. Either 'x' or 'y', for the set
+                to look in.
+        """
+        if side == 'x':
+            by_item, vertices = self._x_by_item, self.x_vertices
+        elif side == 'y':
+            by_item, vertices = self._y_by_item, self.y_vertices
+        else:
+            raise ValueError(
+                "side must be either 'x' or 'y', not {!r}".format(side))
+        if by_item is not None and item == item:
+            try:
+                matches = by_item.get(item)
+            except TypeError:
+                matches = None
+            else:
+                return matches[0] if matches else None
+        for vertex in vertices:
+            if vertex.item == item:
+                return vertex
+        return None
 
     def get_x_set_condition_values(self, x_vertex, *args, **kwargs):
         """
@@ -370,7 +584,8 @@ class MatchingGraph:
 
         - Returns
 
-            This returns
+            This returns whether the vertices are a match and their
+            compatibility as a tupled pair.
         """
         x_conditions, y_conditions = (
             self.get_matching_arguments(x_vertex, y_vertex, *args, **kwargs))
@@ -430,20 +645,136 @@ class MatchingGraph:
         """
         This edges all possible matches between the x_set and the y_set.
         """
+        if self._default_conditions:
+            self._build_edges_by_item()
+            return
         adherence = self.according_to_x_set
         x_vertices, y_vertices = self.x_vertices, self.y_vertices
         a_vertices, b_vertices = [
             (y_vertices, x_vertices), (x_vertices, y_vertices)][adherence]
+        orient = _keep_order if adherence else _swap_order
+        check_match = self._fuse_check_match()
         for vertex_a in a_vertices:
             for vertex_b in b_vertices:
-                vertices = [
-                    (vertex_b, vertex_a), (vertex_a, vertex_b)][adherence]
+                vertices = orient(vertex_a, vertex_b)
                 is_match, compatibility = (
-                    self._check_match(*vertices, *args, **kwargs))
+                    check_match(*vertices, *args, **kwargs))
                 if is_match:
                     edge_args = vertices + (compatibility,)
                     self.edges.append(self.edge_class(*edge_args))
 
+    def _fuse_check_match(self):
+        """
+        A private helper that returns the equivalent of _check_match
+        as a single function, with every matching hook looked up once
+        instead of for every pair. Hooks that were not overridden and
+        only pass values along are skipped entirely.
+        """
+        if type(self)._check_match is not MatchingGraph._check_match:
+            return self._check_match
+        get_conditions = self.get_conditions
+        assess_match = self.assess_match
+        assess_compatibility = self.assess_compatibility
+        default_arguments = (
+            type(self).get_matching_arguments
+            is MatchingGraph.get_matching_arguments
+        )
+        if not default_arguments:
+            get_matching_arguments = self.get_matching_arguments
+
+            def check_match(x_vertex, y_vertex, *args, **kwargs):
+                x_conditions, y_conditions = get_matching_arguments(
+                    x_vertex, y_vertex, *args, **kwargs)
+                conditions = get_conditions(x_conditions, y_conditions)
+                return (
+                    assess_match(conditions, *args, **kwargs),
+                    assess_compatibility(conditions, *args, **kwargs),
+                )
+            return check_match
+
+        get_x_values = self.get_x_set_condition_values
+        get_y_values = self.get_y_set_condition_values
+
+        def check_match(x_vertex, y_vertex, *args, **kwargs):
+            conditions = get_conditions(
+                get_x_values(x_vertex, *args, **kwargs),
+                get_y_values(y_vertex, *args, **kwargs))
+            return (
+                assess_match(conditions, *args, **kwargs),
+                assess_compatibility(conditions, *args, **kwargs),
+            )
+        return check_match
+
+    def _build_edges_by_item(self):
+        """
+        A private shortcut of _build_edges for the default conditions.
+        The vertices grouped by item in _initialize_vertices are used
+        so that each vertex only meets the vertices with an equal item,
+        and every match has a compatibility of 1. If any item is not
+        hashable, the items of every pair are compared instead.
+
+        Items that are not equal to themselves, such as NaN, never
+        match anything, even though a dictionary would find them
+        by identity.
+        """
+        adherence = self.according_to_x_set
+        x_vertices, y_vertices = self.x_vertices, self.y_vertices
+        a_vertices, b_vertices = [
+            (y_vertices, x_vertices), (x_vertices, y_vertices)][adherence]
+        a_by_item, b_by_item = [
+            (self._y_by_item, self._x_by_item),
+            (self._x_by_item, self._y_by_item)][adherence]
+        if a_by_item is not None and b_by_item is not None:
+            partners = [
+                b_by_item.get(vertex_a.item, ())
+                if vertex_a.item == vertex_a.item else ()
+                for vertex_a in a_vertices
+            ]
+        else:
+            partners = [
+                [
+                    vertex_b for vertex_b in b_vertices
+                    if vertex_b.item == vertex_a.item
+                ]
+                for vertex_a in a_vertices
+            ]
+        orient = _keep_order if adherence else _swap_order
+        if not self._can_link_in_batches():
+            for vertex_a, b_partners in zip(a_vertices, partners):
+                for vertex_b in b_partners:
+                    vertices = orient(vertex_a, vertex_b)
+                    self.edges.append(self.edge_class(*vertices, 1))
+            return
+        for vertex_a, b_partners in zip(a_vertices, partners):
+            if not b_partners:
+                continue
+            edges = [
+                self.edge_class(*orient(vertex_a, vertex_b), 1, link=False)
+                for vertex_b in b_partners
+            ]
+            vertex_a.neigbors.extend(b_partners)
+            vertex_a.edges.extend(edges)
+            for vertex_b, edge in zip(b_partners, edges):
+                vertex_b.neigbors.append(vertex_a)
+                vertex_b.edges.append(edge)
+            self.edges.extend(edges)
+
+    def _can_link_in_batches(self):
+        """
+        A private helper for checking if edges can be created without
+        linking them one by one, and have their vertices' neighbors
+        extended in bulk instead. This requires the default edge
+        constructor and the default Vertex.add_neighbor.
+        """
+        vertex_classes = (self.x_set_vertex_class, self.y_set_vertex_class)
+        return (
+            self.edge_class.__init__ is Edge.__init__
+            and all(
+                vertex_class.add_neighbor is Vertex.add_neighbor
+                for vertex_class in vertex_classes
+            )
+        )
+
     def evaluate_match(self, vertex, *args, **kwargs):
         """
         An abstract method for assesing an edge as an optimal match.
@@ -457,7 +788,100 @@ class MatchingGraph:
         An abstract method to assess the optimal matchings.
         """
         adherence = self.according_to_x_set
-        vertices = [self.x_vertices, self.y_vertices][adherence]
+        vertices = self.y_vertices if adherence else self.x_vertices
+        if self._can_match_by_cardinality():
+            self._hopcroft_karp(vertices)
+            return self.matches
         for vertex in vertices:
             self.evaluate_match(vertex, *args, **kwargs)
         return self.matches
+
+    def _can_match_by_cardinality(self):
+        """
+        A private helper for checking if the optimal matching is simply
+        the one with the most matches. This requires the default
+        evaluate_match and edges that all weigh the same.
+        """
+        return (
+            type(self).evaluate_match is MatchingGraph.evaluate_match
+            and len(self.unique_weights) <= 1
+        )
+
+    def _hopcroft_karp(self, vertices):
+        """
+        A private shortcut of match for edges that all weigh the same.
+        This finds a maximum cardinality matching with the
+        Hopcroft-Karp algorithm in O(E * sqrt(V)), where no partner
+        ends up in two matches.
+
+        - Parameters
+
+            :param vertices: :type list:
+                The vertices to find a partner for.
+        """
+        unmatched = -1
+        infinity = float('inf')
+        adjacency = [
+            [
+                (_other_vertex(edge, vertex).index, edge)
+                for edge in vertex.edges
+            ]
+            for vertex in vertices
+        ]
+        partner_count = 1 + max(
+            (index for neighbors in adjacency for index, _ in neighbors),
+            default=unmatched)
+        pair_a = [unmatched] * len(vertices)
+        pair_b = [unmatched] * partner_count
+        matched_edges = [None] * len(vertices)
+
+        while True:
+            # Layer the free vertices and everything reachable from them
+            # through alternating paths.
+            distance = [infinity] * len(vertices)
+            queue = deque()
+            for a, partner in enumerate(pair_a):
+                if partner == unmatched:
+                    distance[a] = 0
+                    queue.append(a)
+            found_free_partner = False
+            while queue:
+                a = queue.popleft()
+                for b, _ in adjacency[a]:
+                    next_a = pair_b[b]
+                    if next_a == unmatched:
+                        found_free_partner = True
+                    elif distance[next_a] == infinity:
+                        distance[next_a] = distance[a] + 1
+                        queue.append(next_a)
+            if not found_free_partner:
+                break
+
+            # Augment along vertex disjoint paths through the layers.
+            cursor = [0] * len(vertices)
+            for root, partner in enumerate(pair_a):
+                if partner != unmatched:
+                    continue
+                path = [root]
+                while path:
+                    a = path[-1]
+                    if cursor[a] == len(adjacency[a]):
+                        distance[a] = infinity
+                        path.pop()
+                        continue
+                    b, _ = adjacency[a][cursor[a]]
+                    next_a = pair_b[b]
+                    if next_a == unmatched:
+                        for step in path:
+                            b, edge = adjacency[step][cursor[step]]
+                            pair_a[step] = b
+                            pair_b[b] = step
+                            matched_edges[step] = edge
+                        break
+                    if distance[next_a] == distance[a] + 1:
+                        path.append(next_a)
+                    else:
+                        cursor[a] += 1
+
+        self.matches.extend(
+            edge for edge in matched_edges if edge is not None)